@@ -5,14 +5,28 @@ Combines multiple YouTube channel feeds into a single Media RSS feed.
 
 Usage:
     python youtube_rss_aggregator.py > skratch_combined.xml
+    python youtube_rss_aggregator.py --pretty > skratch_combined.xml  # indented
 """
 
 import feedparser
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import hashlib
+import heapq
+import json
+import os
 import re
+import string
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
+from email.utils import format_datetime
 import html
-from typing import List, Dict, Optional
+from typing import BinaryIO, Callable, List, Dict, Optional
+from xml.etree import ElementTree
 
 # ============================================================================
 # CONFIGURATION - Add your feeds here
@@ -42,6 +56,79 @@ FEED_DESCRIPTION = "Combined video feed from Skratch Golf YouTube channels"
 FEED_LINK = "https://skratch.golf"
 MAX_ITEMS_PER_CHANNEL = 25
 MAX_TOTAL_ITEMS = 50
+MAX_DESCRIPTION_LENGTH = 500
+MAX_FETCH_WORKERS = 8
+
+# Parsed entries are cached per feed URL between runs. Within the TTL the
+# cache is used without contacting the origin; after it, a conditional GET
+# (ETag / Last-Modified) lets unchanged feeds answer with a bare 304, and a
+# full response whose body hash matches the cached one is not reparsed.
+CACHE_FILE = os.path.expanduser("~/.cache/skratch/feeds.json")
+CACHE_TTL_SECONDS = 600
+# Bump whenever parsing changes what ends up in an entry, so stale caches are ignored
+CACHE_VERSION = 1
+
+# Shared HTTP session so repeated requests to the same host reuse connections.
+# The pool is sized from MAX_FETCH_WORKERS so concurrent fetches never block
+# waiting for a free connection, and rate limiting or transient server errors
+# are retried with backoff instead of dropping the feed for this run. Retry-After
+# is ignored: a long value would stall a worker (and the cron job) for hours.
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=MAX_FETCH_WORKERS,
+    pool_maxsize=2 * MAX_FETCH_WORKERS,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+        respect_retry_after_header=False,
+    ),
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+SESSION.headers.update({"User-Agent": "Mozilla/5.0 SkratchAggregator"})
+
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+YT_ID_RE = re.compile(r"v=([a-zA-Z0-9_-]{11})")
+YT_ID_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+YT_THUMBNAIL_URL = "https://img.youtube.com/vi/{}/hqdefault.jpg"
+YT_EMBED_URL = "https://www.youtube.com/embed/{}"
+
+# Clark-notation tags and paths for reading YouTube's Atom feeds, built once so
+# lookups don't go through namespace-prefix expansion on every call
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+YT_NS = "{http://www.youtube.com/xml/schemas/2015}"
+MEDIA_NS = "{http://search.yahoo.com/mrss/}"
+TAG_ATOM_FEED = ATOM_NS + "feed"
+TAG_ATOM_ENTRY = ATOM_NS + "entry"
+TAG_ATOM_TITLE = ATOM_NS + "title"
+TAG_ATOM_PUBLISHED = ATOM_NS + "published"
+TAG_YT_VIDEO_ID = YT_NS + "videoId"
+PATH_ATOM_ALTERNATE_LINK = ATOM_NS + "link[@rel='alternate']"
+PATH_ATOM_AUTHOR_NAME = ATOM_NS + "author/" + ATOM_NS + "name"
+PATH_MEDIA_DESCRIPTION = MEDIA_NS + "group/" + MEDIA_NS + "description"
+
+
+@dataclass(slots=True)
+class Entry:
+    """A single video or article, normalized from any source feed."""
+    title: str
+    link: str
+    video_id: Optional[str]
+    description: str
+    published: datetime
+    author: str
+    channel_name: str
+    channel_id: Optional[str]
+    thumbnail_high: Optional[str]
+    embed_url: Optional[str]
+    content_type: str
+
+
+# Feed URL -> {"fingerprint", "etag", "last_modified", "hash", "fetched_at", "entries"};
+# loaded in main()
+_feed_cache: Dict[str, Dict] = {}
 
 
 # ============================================================================
@@ -53,60 +140,255 @@ def get_youtube_rss_url(channel_id: str) -> str:
     return f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
 
 
-def fetch_standard_rss_feed(feed_config: Dict) -> List[Dict]:
+def extract_video_id(link: str) -> str:
+    """Extract the 11-character video ID from a YouTube watch link."""
+    # Plain string checks cover the usual ".../watch?v=ID" shape; the regex
+    # handles anything unusual, such as another "v=" earlier in the URL
+    _, sep, rest = link.partition("v=")
+    candidate = rest[:11]
+    if sep and len(candidate) == 11 and YT_ID_CHARS.issuperset(candidate):
+        return candidate
+    match = YT_ID_RE.search(link)
+    return match.group(1) if match else ""
+
+
+def html_to_text(markup: str, limit: int = MAX_DESCRIPTION_LENGTH) -> str:
+    """Reduce an HTML fragment to whitespace-normalized plain text."""
+    # feedparser has already sanitized the markup, so dropping tags and
+    # decoding entities is enough; tags become spaces so words don't merge.
+    text = html.unescape(HTML_TAG_RE.sub(' ', markup))
+    return ' '.join(text.split())[:limit]
+
+
+def load_feed_cache() -> Dict[str, Dict]:
+    """Load the on-disk feed cache, or an empty one if missing or unreadable."""
+    try:
+        with open(CACHE_FILE, encoding="utf-8") as f:
+            cache = json.load(f)
+        for cached in cache.values():
+            entries = []
+            for fields in cached["entries"]:
+                published = datetime.fromisoformat(fields.pop("published"))
+                if published.tzinfo is None:
+                    published = published.replace(tzinfo=timezone.utc)
+                entries.append(Entry(published=published, **fields))
+            cached["entries"] = entries
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return {}
+    return cache
+
+
+def save_feed_cache(cache: Dict[str, Dict]) -> None:
+    """Write the feed cache to disk atomically."""
+    os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+    tmp_path = CACHE_FILE + ".tmp"
+    serializable = {
+        url: {**cached, "entries": [asdict(entry) for entry in cached["entries"]]}
+        for url, cached in cache.items()
+    }
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(serializable, f, default=lambda dt: dt.isoformat())
+    os.replace(tmp_path, CACHE_FILE)
+
+
+def cache_fingerprint(feed_config: Dict) -> str:
+    """Identify the config and parser settings that a feed's entries were built with."""
+    key = json.dumps(
+        [CACHE_VERSION, MAX_ITEMS_PER_CHANNEL, MAX_DESCRIPTION_LENGTH, feed_config],
+        sort_keys=True,
+    )
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def fetch_feed(feed_url: str, feed_config: Dict,
+               parse: Callable[[requests.Response], List[Entry]]) -> List[Entry]:
+    """Fetch a feed and parse it, reusing cached entries when it hasn't changed."""
+    # Entries carry config values (channel name, content type, ...), so a cache
+    # built from a different config or parser version is treated as a miss
+    fingerprint = cache_fingerprint(feed_config)
+    cached = _feed_cache.get(feed_url)
+    if cached and cached.get("fingerprint") != fingerprint:
+        cached = None
+    if cached and time.time() - cached["fetched_at"] < CACHE_TTL_SECONDS:
+        return cached["entries"]
+    
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+    
+    response = SESSION.get(feed_url, headers=headers, timeout=15)
+    if cached and response.status_code == 304:
+        cached["fetched_at"] = time.time()
+        return cached["entries"]
+    response.raise_for_status()
+    
+    # Servers that ignore conditional requests still often send identical bodies.
+    # The hash is keyed with the fingerprint, so an unchanged body only matches
+    # entries parsed under the current config and parser version.
+    body_hash = hashlib.blake2b(response.content, digest_size=16,
+                                key=fingerprint.encode("ascii")).hexdigest()
+    if cached and cached.get("hash") == body_hash:
+        entries = cached["entries"]
+    else:
+        entries = parse(response)
+    
+    _feed_cache[feed_url] = {
+        "fingerprint": fingerprint,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "hash": body_hash,
+        "fetched_at": time.time(),
+        "entries": entries,
+    }
+    return entries
+
+
+def parse_standard_rss_entries(response: requests.Response, feed_config: Dict) -> List[Entry]:
+    """Parse a standard RSS feed response into entries."""
+    feed = feedparser.parse(response.content)
+    entries = []
+    
+    for entry in feed.entries[:MAX_ITEMS_PER_CHANNEL]:
+        published = entry.get("published_parsed") or entry.get("updated_parsed")
+        if published:
+            pub_datetime = datetime(*published[:6], tzinfo=timezone.utc)
+        else:
+            pub_datetime = datetime.now(timezone.utc)
+        
+        thumbnail = ""
+        for media in entry.get('media_content') or ():
+            if media.get('medium') == 'image' or media.get('type', '').startswith('image'):
+                thumbnail = media.get('url', '')
+                break
+        if not thumbnail:
+            media_thumbnail = entry.get('media_thumbnail')
+            if media_thumbnail:
+                thumbnail = media_thumbnail[0].get('url', '')
+        
+        description = entry.get("description", "") or entry.get("summary", "")
+        description_plain = html_to_text(description) if description else ''
+        
+        entries.append(Entry(
+            title=entry.get("title", "Untitled"),
+            link=entry.get("link", ""),
+            video_id=None,
+            description=description_plain,
+            published=pub_datetime,
+            author=entry.get("author", "") or feed_config.get("name", "Skratch"),
+            channel_name=feed_config.get("name", "Unknown"),
+            channel_id=None,
+            thumbnail_high=thumbnail,
+            embed_url=None,
+            content_type=feed_config.get("content_type", "article"),
+        ))
+    
+    return entries
+
+
+def fetch_standard_rss_feed(feed_config: Dict) -> List[Entry]:
     """Fetch and parse a standard RSS feed."""
     feed_url = feed_config.get("url")
     if not feed_url:
         return []
     
     try:
-        # Fetch with requests first
-        response = requests.get(feed_url, timeout=15)
-        response.raise_for_status()
-        feed = feedparser.parse(response.text)
-        entries = []
-        
-        for entry in feed.entries[:MAX_ITEMS_PER_CHANNEL]:
-            published = entry.get("published_parsed") or entry.get("updated_parsed")
-            if published:
-                pub_datetime = datetime(*published[:6])
-            else:
-                pub_datetime = datetime.now()
-            
-            thumbnail = ""
-            if hasattr(entry, 'media_content') and entry.media_content:
-                for media in entry.media_content:
-                    if media.get('medium') == 'image' or media.get('type', '').startswith('image'):
-                        thumbnail = media.get('url', '')
-                        break
-            if not thumbnail and hasattr(entry, 'media_thumbnail') and entry.media_thumbnail:
-                thumbnail = entry.media_thumbnail[0].get('url', '')
-            
-            description = entry.get("description", "") or entry.get("summary", "")
-            description_plain = re.sub(r'<[^>]+>', '', description)[:500]
-            
-            entries.append({
-                "title": entry.get("title", "Untitled"),
-                "link": entry.get("link", ""),
-                "video_id": None,
-                "description": description_plain,
-                "published": pub_datetime,
-                "author": entry.get("author", "") or feed_config.get("name", "Skratch"),
-                "channel_name": feed_config.get("name", "Unknown"),
-                "channel_id": None,
-                "thumbnail_high": thumbnail,
-                "embed_url": None,
-                "content_type": feed_config.get("content_type", "article"),
-            })
-        
-        return entries
-        
+        return fetch_feed(feed_url, feed_config, lambda response: parse_standard_rss_entries(response, feed_config))
     except Exception as e:
         print(f"<!-- Warning: Error fetching {feed_config.get('name', 'Unknown')}: {e} -->")
         return []
 
 
-def fetch_channel_feed(channel: Dict) -> List[Dict]:
+def make_video_entry(channel: Dict, title: str, link: str, video_id: str,
+                     description: str, published: datetime, author: str) -> Entry:
+    """Build a video entry for a YouTube channel from its extracted fields."""
+    # The feed only ever emits the hqdefault thumbnail, so no other sizes are built
+    if video_id:
+        thumbnail_high = YT_THUMBNAIL_URL.format(video_id)
+        embed_url = YT_EMBED_URL.format(video_id)
+    else:
+        thumbnail_high = embed_url = None
+    
+    return Entry(
+        title=title,
+        link=link,
+        video_id=video_id,
+        description=description[:MAX_DESCRIPTION_LENGTH],
+        published=published,
+        author=author or channel.get("name", "Skratch"),
+        channel_name=channel.get("name", "Unknown"),
+        channel_id=channel.get("channel_id"),
+        thumbnail_high=thumbnail_high,
+        embed_url=embed_url,
+        content_type="video",
+    )
+
+
+def parse_channel_entries(response: requests.Response, channel: Dict) -> List[Entry]:
+    """Parse a YouTube channel feed response into entries."""
+    # YouTube channel feeds are always Atom with a small fixed schema, so they
+    # are read directly rather than through feedparser's format detection.
+    # Anything else (malformed XML, a different root) goes through feedparser.
+    try:
+        root = ElementTree.fromstring(response.content)
+    except ElementTree.ParseError:
+        return parse_channel_entries_with_feedparser(response, channel)
+    if root.tag != TAG_ATOM_FEED:
+        return parse_channel_entries_with_feedparser(response, channel)
+    entries = []
+    
+    for node in root.findall(TAG_ATOM_ENTRY)[:MAX_ITEMS_PER_CHANNEL]:
+        link_node = node.find(PATH_ATOM_ALTERNATE_LINK)
+        link = link_node.get("href", "") if link_node is not None else ""
+        
+        try:
+            pub_datetime = datetime.fromisoformat(node.findtext(TAG_ATOM_PUBLISHED, ""))
+            pub_datetime = pub_datetime.astimezone(timezone.utc)
+        except ValueError:
+            pub_datetime = datetime.now(timezone.utc)
+        
+        entries.append(make_video_entry(
+            channel,
+            title=node.findtext(TAG_ATOM_TITLE, "Untitled"),
+            link=link,
+            video_id=node.findtext(TAG_YT_VIDEO_ID, "") or extract_video_id(link),
+            description=node.findtext(PATH_MEDIA_DESCRIPTION, ""),
+            published=pub_datetime,
+            author=node.findtext(PATH_ATOM_AUTHOR_NAME, ""),
+        ))
+    
+    return entries
+
+
+def parse_channel_entries_with_feedparser(response: requests.Response, channel: Dict) -> List[Entry]:
+    """Parse a YouTube channel feed that isn't well-formed Atom using feedparser."""
+    feed = feedparser.parse(response.content)
+    entries = []
+    
+    for entry in feed.entries[:MAX_ITEMS_PER_CHANNEL]:
+        link = entry.get("link", "")
+        
+        published = entry.get("published_parsed")
+        if published:
+            pub_datetime = datetime(*published[:6], tzinfo=timezone.utc)
+        else:
+            pub_datetime = datetime.now(timezone.utc)
+        
+        entries.append(make_video_entry(
+            channel,
+            title=entry.get("title", "Untitled"),
+            link=link,
+            video_id=entry.get("yt_videoid", "") or extract_video_id(link),
+            description=entry.get("summary", ""),
+            published=pub_datetime,
+            author=entry.get("author", ""),
+        ))
+    
+    return entries
+
+
+def fetch_channel_feed(channel: Dict) -> List[Entry]:
     """Fetch and parse a YouTube channel's RSS feed."""
     channel_id = channel.get("channel_id")
     if not channel_id:
@@ -115,121 +397,160 @@ def fetch_channel_feed(channel: Dict) -> List[Dict]:
     feed_url = get_youtube_rss_url(channel_id)
     
     try:
-        # Fetch with requests first (feedparser sometimes can't fetch directly)
-        response = requests.get(feed_url, timeout=15)
-        response.raise_for_status()
-        feed = feedparser.parse(response.text)
-        entries = []
-        
-        for entry in feed.entries[:MAX_ITEMS_PER_CHANNEL]:
-            video_id = entry.get("yt_videoid", "")
-            if not video_id:
-                link = entry.get("link", "")
-                match = re.search(r"v=([a-zA-Z0-9_-]{11})", link)
-                if match:
-                    video_id = match.group(1)
-            
-            published = entry.get("published_parsed")
-            if published:
-                pub_datetime = datetime(*published[:6])
-            else:
-                pub_datetime = datetime.now()
-            
-            thumbnail_high = f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
-            
-            entries.append({
-                "title": entry.get("title", "Untitled"),
-                "link": entry.get("link", ""),
-                "video_id": video_id,
-                "description": entry.get("summary", ""),
-                "published": pub_datetime,
-                "author": entry.get("author", channel.get("name", "Skratch")),
-                "channel_name": channel.get("name", "Unknown"),
-                "channel_id": channel_id,
-                "thumbnail_high": thumbnail_high,
-                "embed_url": f"https://www.youtube.com/embed/{video_id}",
-                "content_type": "video",
-            })
-        
-        return entries
-        
+        return fetch_feed(feed_url, channel, lambda response: parse_channel_entries(response, channel))
     except Exception as e:
         print(f"<!-- Warning: Error fetching {channel.get('name', 'Unknown')}: {e} -->")
         return []
 
 
-def build_mrss_feed(entries: List[Dict]) -> str:
-    """Build a Media RSS (MRSS) feed from the combined entries."""
-    lines = []
-    lines.append('<rss version="2.0"')
-    lines.append('  xmlns:atom="http://www.w3.org/2005/Atom"')
-    lines.append('  xmlns:media="http://search.yahoo.com/mrss/"')
-    lines.append('  xmlns:yt="http://www.youtube.com/xml/schemas/2015"')
-    lines.append('  xmlns:dc="http://purl.org/dc/elements/1.1/">')
-    lines.append('<channel>')
-    lines.append(f'  <title>{html.escape(FEED_TITLE)}</title>')
-    lines.append(f'  <link>{html.escape(FEED_LINK)}</link>')
-    lines.append(f'  <description>{html.escape(FEED_DESCRIPTION)}</description>')
-    lines.append('  <language>en-us</language>')
-    lines.append(f'  <lastBuildDate>{datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S +0000")}</lastBuildDate>')
-    lines.append('  <generator>Skratch YouTube RSS Aggregator</generator>')
+# Feed document templates, written indented for readability. Every field is
+# filled with already-escaped text.
+FEED_HEADER_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"
+  xmlns:atom="http://www.w3.org/2005/Atom"
+  xmlns:media="http://search.yahoo.com/mrss/"
+  xmlns:yt="http://www.youtube.com/xml/schemas/2015"
+  xmlns:dc="http://purl.org/dc/elements/1.1/">
+<channel>
+  <title>{title}</title>
+  <link>{link}</link>
+  <description>{description}</description>
+  <language>en-us</language>
+  <lastBuildDate>{last_build_date}</lastBuildDate>
+  <generator>Skratch YouTube RSS Aggregator</generator>
+"""
+
+ITEM_TEMPLATE = """  <item>
+    <title>{title}</title>
+    <link>{link}</link>
+    <guid isPermaLink="true">{link}</guid>
+    <pubDate>{pub_date}</pubDate>
+    <dc:creator>{author}</dc:creator>
+    <description>{description}</description>
+{media}    <category>{channel_name}</category>
+{content_type}  </item>
+"""
+
+THUMBNAIL_TEMPLATE = """    <media:thumbnail url="{url}"/>
+"""
+
+VIDEO_TEMPLATE = """    <media:content url="{embed_url}" type="text/html" medium="video"/>
+    <yt:videoId>{video_id}</yt:videoId>
+"""
+
+CHANNEL_ID_TEMPLATE = """    <yt:channelId>{channel_id}</yt:channelId>
+"""
+
+CATEGORY_TEMPLATE = """    <category>{category}</category>
+"""
+
+FEED_FOOTER = """</channel>
+</rss>
+"""
+
+FEED_TITLE_ESC = html.escape(FEED_TITLE)
+FEED_LINK_ESC = html.escape(FEED_LINK)
+FEED_DESCRIPTION_ESC = html.escape(FEED_DESCRIPTION)
+
+
+def compact_template(template: str) -> str:
+    """Remove the indentation and line breaks between tags in a feed template."""
+    template = re.sub(r">\s+", ">", template)
+    template = re.sub(r"\s+<", "<", template)
+    # Line breaks left inside a tag separate attributes, so keep one space
+    return re.sub(r"\s*\n\s*", " ", template)
+
+
+PRETTY_TEMPLATES = {
+    "header": FEED_HEADER_TEMPLATE,
+    "item": ITEM_TEMPLATE,
+    "thumbnail": THUMBNAIL_TEMPLATE,
+    "video": VIDEO_TEMPLATE,
+    "channel_id": CHANNEL_ID_TEMPLATE,
+    "category": CATEGORY_TEMPLATE,
+    "footer": FEED_FOOTER,
+}
+# Readers ignore the whitespace, so the published feed is written without it
+COMPACT_TEMPLATES = {name: compact_template(t) for name, t in PRETTY_TEMPLATES.items()}
+
+
+def write_mrss_feed(entries: List[Entry], out: BinaryIO, pretty: bool = False) -> None:
+    """Write a UTF-8 encoded Media RSS (MRSS) feed of the combined entries to out."""
+    templates = PRETTY_TEMPLATES if pretty else COMPACT_TEMPLATES
+    
+    # Items are encoded and written one at a time so the whole document is
+    # never held in memory
+    out.write(templates["header"].format(
+        title=FEED_TITLE_ESC,
+        link=FEED_LINK_ESC,
+        description=FEED_DESCRIPTION_ESC,
+        last_build_date=format_datetime(datetime.now(timezone.utc)),
+    ).encode("utf-8"))
     
     for entry in entries:
-        lines.append('  <item>')
-        lines.append(f'    <title>{html.escape(entry["title"])}</title>')
-        lines.append(f'    <link>{html.escape(entry["link"])}</link>')
-        lines.append(f'    <guid isPermaLink="true">{html.escape(entry["link"])}</guid>')
-        lines.append(f'    <pubDate>{entry["published"].strftime("%a, %d %b %Y %H:%M:%S +0000")}</pubDate>')
-        lines.append(f'    <dc:creator>{html.escape(entry["author"])}</dc:creator>')
+        # Each field is escaped once and reused wherever the item repeats it
+        link_esc = html.escape(entry.link)
+        video_id = entry.video_id
         
-        desc = html.escape(entry.get("description", "")[:500])
-        if entry.get("video_id"):
-            desc_html = f'&lt;p&gt;{desc}&lt;/p&gt;&lt;p&gt;&lt;a href="{html.escape(entry["link"])}"&gt;Watch on YouTube&lt;/a&gt;&lt;/p&gt;'
-        else:
-            desc_html = f'&lt;p&gt;{desc}&lt;/p&gt;&lt;p&gt;&lt;a href="{html.escape(entry["link"])}"&gt;Read more&lt;/a&gt;&lt;/p&gt;'
-        lines.append(f'    <description>{desc_html}</description>')
-        
-        if entry.get("thumbnail_high"):
-            lines.append(f'    <media:thumbnail url="{html.escape(entry["thumbnail_high"])}"/>')
-        
-        if entry.get("video_id"):
-            lines.append(f'    <media:content url="{html.escape(entry["embed_url"])}" type="text/html" medium="video"/>')
-            lines.append(f'    <yt:videoId>{html.escape(entry["video_id"])}</yt:videoId>')
+        # Descriptions (already truncated when fetched) are plain text: escape
+        # once for the embedded HTML and once more for the XML element
+        desc = html.escape(entry.description)
+        link_text = "Watch on YouTube" if video_id else "Read more"
+        desc_html = f'<p>{desc}</p><p><a href="{link_esc}">{link_text}</a></p>'
         
-        if entry.get("channel_id"):
-            lines.append(f'    <yt:channelId>{html.escape(entry["channel_id"])}</yt:channelId>')
+        media = ""
+        if entry.thumbnail_high:
+            media += templates["thumbnail"].format(url=html.escape(entry.thumbnail_high))
+        if video_id:
+            media += templates["video"].format(
+                embed_url=html.escape(entry.embed_url),
+                video_id=html.escape(video_id),
+            )
+        if entry.channel_id:
+            media += templates["channel_id"].format(channel_id=html.escape(entry.channel_id))
         
-        lines.append(f'    <category>{html.escape(entry["channel_name"])}</category>')
-        if entry.get("content_type"):
-            lines.append(f'    <category>{html.escape(entry["content_type"])}</category>')
+        content_type = ""
+        if entry.content_type:
+            content_type = templates["category"].format(category=html.escape(entry.content_type))
         
-        lines.append('  </item>')
+        out.write(templates["item"].format(
+            title=html.escape(entry.title),
+            link=link_esc,
+            pub_date=format_datetime(entry.published),
+            author=html.escape(entry.author),
+            description=html.escape(desc_html, quote=False),
+            media=media,
+            channel_name=html.escape(entry.channel_name),
+            content_type=content_type,
+        ).encode("utf-8"))
     
-    lines.append('</channel>')
-    lines.append('</rss>')
-    
-    return '\n'.join(lines)
+    out.write(templates["footer"].encode("utf-8"))
 
 
 def main():
     """Main function to generate the combined feed."""
     all_entries = []
+    _feed_cache.update(load_feed_cache())
     
-    for channel in YOUTUBE_CHANNELS:
-        entries = fetch_channel_feed(channel)
-        all_entries.extend(entries)
+    # Feeds are fetched concurrently; each job is network-bound
+    jobs = [(fetch_channel_feed, channel) for channel in YOUTUBE_CHANNELS]
+    jobs += [(fetch_standard_rss_feed, feed) for feed in RSS_FEEDS]
     
-    for feed in RSS_FEEDS:
-        entries = fetch_standard_rss_feed(feed)
-        all_entries.extend(entries)
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(jobs))) as executor:
+        futures = [executor.submit(fn, arg) for fn, arg in jobs]
+        for future in as_completed(futures):
+            all_entries.extend(future.result())
     
-    all_entries.sort(key=lambda x: x["published"], reverse=True)
-    all_entries = all_entries[:MAX_TOTAL_ITEMS]
+    try:
+        save_feed_cache(_feed_cache)
+    except OSError as e:
+        print(f"<!-- Warning: Could not write feed cache: {e} -->")
     
-    feed_xml = build_mrss_feed(all_entries)
+    all_entries = heapq.nlargest(MAX_TOTAL_ITEMS, all_entries, key=lambda x: x.published)
     
-    print('<?xml version="1.0" encoding="UTF-8"?>')
-    print(feed_xml)
+    # Flush any warnings printed so far before writing bytes underneath them
+    sys.stdout.flush()
+    write_mrss_feed(all_entries, sys.stdout.buffer, pretty="--pretty" in sys.argv[1:])
 
 
 if __name__ == "__main__":